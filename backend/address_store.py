@@ -0,0 +1,76 @@
+"""
+Persistent store of geocoded addresses
+
+Addresses resolved through Nominatim are saved to a local SQLite file so they
+survive restarts and are shared by every worker on the host. The store can
+also be seeded at deploy time from a CSV of pre-geocoded addresses with
+`flask seed-addresses`.
+"""
+
+import csv
+import sqlite3
+import threading
+import unicodedata
+
+
+def normalize_address(address):
+    """Normalize an address for lookups (case, accents, whitespace)"""
+    normalized = unicodedata.normalize('NFKD', address)
+    normalized = ''.join(c for c in normalized if not unicodedata.combining(c))
+    return ' '.join(normalized.lower().split())
+
+
+class AddressStore:
+    """SQLite-backed map of normalized address -> (lat, lng, resolved_address)"""
+    
+    def __init__(self, path):
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS addresses ('
+                'query TEXT PRIMARY KEY, lat REAL NOT NULL, lng REAL NOT NULL, '
+                'resolved TEXT NOT NULL) WITHOUT ROWID'
+            )
+    
+    def lookup(self, key):
+        """Return (lat, lng, resolved_address) for a normalized address, or None"""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT lat, lng, resolved FROM addresses WHERE query = ?', (key,)
+            ).fetchone()
+        return tuple(row) if row else None
+    
+    def save(self, key, lat, lng, resolved):
+        """Remember a resolved address"""
+        self.save_many([(key, lat, lng, resolved)])
+    
+    def save_many(self, rows):
+        """Remember many (key, lat, lng, resolved) rows at once"""
+        with self._lock, self._conn:
+            self._conn.executemany(
+                'INSERT OR REPLACE INTO addresses (query, lat, lng, resolved) VALUES (?, ?, ?, ?)',
+                rows
+            )
+    
+    def seed_from_csv(self, path):
+        """
+        Load pre-geocoded addresses from a CSV file
+        
+        Columns: address, lat, lng and an optional resolved address.
+        Returns the number of rows loaded.
+        """
+        rows = []
+        with open(path, newline='', encoding='utf-8') as f:
+            for record in csv.reader(f):
+                if len(record) < 3 or not record[0].strip():
+                    continue
+                try:
+                    lat, lng = float(record[1]), float(record[2])
+                except ValueError:
+                    continue  # header or malformed row
+                resolved = record[3].strip() if len(record) > 3 and record[3].strip() else record[0].strip()
+                rows.append((normalize_address(record[0]), lat, lng, resolved))
+        self.save_many(rows)
+        return len(rows)
@@ -4,13 +4,32 @@ Flask Application Factory and Entry Point
 This module creates and configures the Flask application.
 """
 
+import os
+import sqlite3
+import click
 from flask import Flask, jsonify
 from flask_cors import CORS
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.schema import CreateIndex
 from config import get_config
+from json_provider import OrjsonProvider
 from models.user import db
+from location_writer import LocationWriter
+from address_store import AddressStore
 from routes import register_blueprints
 
 
+@event.listens_for(Engine, 'connect')
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Enable WAL journaling on SQLite connections for concurrent reads/writes"""
+    if isinstance(dbapi_connection, sqlite3.Connection):
+        cursor = dbapi_connection.cursor()
+        cursor.execute('PRAGMA journal_mode=WAL')
+        cursor.execute('PRAGMA synchronous=NORMAL')
+        cursor.close()
+
+
 def create_app(config=None):
     """
     Application factory function
@@ -24,6 +43,7 @@ def create_app(config=None):
     
     # Create Flask app instance
     app = Flask(__name__)
+    app.json = OrjsonProvider(app)
     
     # Load configuration
     if config is None:
@@ -36,6 +56,12 @@ def create_app(config=None):
     # Initialize database
     db.init_app(app)
     
+    # Background writer for last verified locations
+    app.extensions['location_writer'] = LocationWriter(app)
+    
+    # Local store of geocoded addresses
+    init_address_store(app)
+    
     # Register error handlers
     register_error_handlers(app)
     
@@ -51,9 +77,14 @@ def create_app(config=None):
             'message': 'Backend is running'
         }), 200
     
-    # Create database tables
-    with app.app_context():
-        db.create_all()
+    # Register CLI commands
+    register_commands(app)
+    
+    # Create database tables (production runs `flask init-db` once at deploy
+    # instead of every worker doing it on boot)
+    if app.config['AUTO_CREATE_TABLES']:
+        with app.app_context():
+            create_tables()
     
     return app
 
@@ -83,10 +114,66 @@ def register_error_handlers(app):
         }), 500
 
 
+def init_address_store(app):
+    """Open the local geocoded-address store if one is configured"""
+    path = app.config['GEOCODE_STORE_PATH']
+    if not path:
+        return
+    if not os.path.isabs(path):
+        os.makedirs(app.instance_path, exist_ok=True)
+        path = os.path.join(app.instance_path, path)
+    app.extensions['address_store'] = AddressStore(path)
+
+
+def create_tables():
+    """
+    Create database tables, then any indexes missing from existing tables
+    
+    db.create_all() skips tables that already exist, so databases created
+    before an index was declared (e.g. the lower() username/email indexes)
+    would otherwise never get it. Must run inside an app context.
+    """
+    db.create_all()
+    with db.engine.begin() as connection:
+        for table in db.metadata.sorted_tables:
+            for index in table.indexes:
+                # Expression indexes can't be reflected, so let the database
+                # skip existing ones (CREATE INDEX IF NOT EXISTS)
+                connection.execute(CreateIndex(index, if_not_exists=True))
+
+
+def register_commands(app):
+    """Register Flask CLI commands"""
+    
+    @app.cli.command('init-db')
+    def init_db():
+        """Create database tables and any indexes missing from existing tables"""
+        create_tables()
+        click.echo('Database tables created')
+    
+    @app.cli.command('seed-addresses')
+    @click.argument('csv_path')
+    def seed_addresses(csv_path):
+        """Load pre-geocoded addresses (address,lat,lng[,resolved]) from a CSV"""
+        store = app.extensions.get('address_store')
+        if store is None:
+            click.echo('GEOCODE_STORE_PATH is not configured')
+            return
+        click.echo(f'Loaded {store.seed_from_csv(csv_path)} addresses')
+
+
 def main():
-    """Entry point for running the application"""
+    """Entry point for running the application (development server)"""
+    app = create_app()
+    app.run(debug=True, host='localhost', port=3000, use_reloader=False, threaded=True)
+
+
+def serve():
+    """Run the application on waitress, a multi-threaded production WSGI server"""
+    from waitress import serve as waitress_serve
+    
     app = create_app()
-    app.run(debug=True, host='localhost', port=3000, use_reloader=False)
+    waitress_serve(app, host='0.0.0.0', port=3000, threads=8)
 
 
 if __name__ == '__main__':
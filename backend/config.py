@@ -7,6 +7,20 @@ Use environment variables to control which config is loaded.
 
 import os
 from datetime import timedelta
+from sqlalchemy.pool import StaticPool
+
+
+def engine_options(database_uri):
+    """SQLAlchemy engine options suited to the database backend"""
+    if database_uri.startswith('sqlite'):
+        # Threaded workers share SQLite connections across threads
+        return {'connect_args': {'check_same_thread': False}}
+    return {
+        'pool_size': 20,
+        'max_overflow': 40,
+        'pool_pre_ping': True,
+        'pool_recycle': 1800
+    }
 
 
 class Config:
@@ -15,6 +29,7 @@ class Config:
     # Database
     SQLALCHEMY_DATABASE_URI = os.getenv('DATABASE_URL', 'sqlite:///users.db')
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options(SQLALCHEMY_DATABASE_URI)
     
     # JWT Configuration
     SECRET_KEY = os.getenv('SECRET_KEY', 'your-secret-key-change-in-production')
@@ -22,6 +37,15 @@ class Config:
     
     # API Configuration
     JSON_SORT_KEYS = False
+    
+    # Create tables when the app is created (disabled in production)
+    AUTO_CREATE_TABLES = True
+    
+    # Batch last-verified-location writes on a background thread
+    LOCATION_WRITE_BEHIND = True
+    
+    # Local SQLite store of geocoded addresses (relative to the instance folder)
+    GEOCODE_STORE_PATH = os.getenv('GEOCODE_STORE_PATH', 'addresses.db')
 
 
 class DevelopmentConfig(Config):
@@ -34,6 +58,7 @@ class ProductionConfig(Config):
     """Production configuration"""
     DEBUG = False
     TESTING = False
+    AUTO_CREATE_TABLES = False
     # Uses SECRET_KEY from base Config with default value
     # Override if needed: SECRET_KEY = os.getenv('SECRET_KEY')
 
@@ -43,6 +68,13 @@ class TestingConfig(Config):
     DEBUG = True
     TESTING = True
     SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    LOCATION_WRITE_BEHIND = False
+    GEOCODE_STORE_PATH = None
+    # Share the single in-memory database across sessions
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        'poolclass': StaticPool,
+        'connect_args': {'check_same_thread': False}
+    }
 
 
 # Config factory
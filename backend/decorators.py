@@ -1,7 +1,31 @@
 import jwt
+import time
+import hashlib
+import threading
 from functools import wraps
-from flask import request, jsonify, current_app
-from models.user import User
+from cachetools import TTLCache
+from flask import request, jsonify, current_app, make_response
+from sqlalchemy import select
+from sqlalchemy.orm import raiseload
+from models.user import User, db
+
+# Verified tokens, keyed by (signing secret, digest of the raw token) -> (user_id, exp_ts)
+_token_cache = TTLCache(maxsize=10000, ttl=30)
+_token_cache_lock = threading.Lock()
+
+
+def _token_cache_key(secret_key, token):
+    """
+    Build the cache key for a raw JWT (128-bit BLAKE2b digest)
+    Scoped to the signing secret so apps with different keys never share entries
+    """
+    return secret_key, hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+
+def _invalidate_token(cache_key):
+    """Drop a token from the verification cache"""
+    with _token_cache_lock:
+        _token_cache.pop(cache_key, None)
 
 
 def token_required(f):
@@ -24,17 +48,70 @@ def token_required(f):
         if not token:
             return jsonify({'message': 'Token is missing'}), 401
         
+        secret_key = current_app.config['SECRET_KEY']
+        cache_key = _token_cache_key(secret_key, token)
+        with _token_cache_lock:
+            cached = _token_cache.get(cache_key)
+        
         try:
-            # Decode JWT token
-            data = jwt.decode(token, current_app.config['SECRET_KEY'], algorithms=['HS256'])
-            current_user = User.query.get(data['user_id'])
+            if cached and cached[1] > time.time():
+                user_id = cached[0]
+            else:
+                # Decode JWT token
+                data = jwt.decode(
+                    token, secret_key, algorithms=['HS256'],
+                    options={'require': ['exp', 'user_id']}
+                )
+                user_id = data['user_id']
+                with _token_cache_lock:
+                    _token_cache[cache_key] = (user_id, data['exp'])
+            
+            # Relationships must be opted in (selectinload) rather than lazy loaded
+            current_user = db.session.execute(
+                select(User).where(User.id == user_id).options(raiseload('*'))
+            ).scalar_one_or_none()
             if not current_user:
+                _invalidate_token(cache_key)
                 return jsonify({'message': 'User not found'}), 401
         except jwt.ExpiredSignatureError:
+            _invalidate_token(cache_key)
             return jsonify({'message': 'Token has expired'}), 401
         except jwt.InvalidTokenError:
+            _invalidate_token(cache_key)
             return jsonify({'message': 'Invalid token'}), 401
         
         return f(current_user, *args, **kwargs)
     
     return decorated
+
+
+def user_etag(user):
+    """Weak ETag value that changes whenever the user's location is re-verified"""
+    verified = user.last_verification_time.timestamp() if user.last_verification_time else 0
+    return f'{user.id}-{int(verified * 1000000)}'
+
+
+def conditional_per_user(max_age=30):
+    """
+    Decorator adding a per-user ETag and private Cache-Control to a read endpoint
+    Answers 304 Not Modified without running the view when If-None-Match matches
+    Must be applied below @token_required
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated(current_user, *args, **kwargs):
+            etag = user_etag(current_user)
+            
+            if request.if_none_match.contains_weak(etag):
+                response = current_app.response_class(status=304)
+            else:
+                response = make_response(f(current_user, *args, **kwargs))
+            
+            response.set_etag(etag, weak=True)
+            response.cache_control.private = True
+            response.cache_control.max_age = max_age
+            return response
+        
+        return decorated
+    
+    return decorator
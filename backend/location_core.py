@@ -0,0 +1,42 @@
+"""
+Distance and proximity classification for location verification
+
+Pure numeric helpers kept free of Flask/geopy so they stay cheap to call
+and can be reused by bulk verification.
+"""
+
+from math import radians, sin, cos, asin, sqrt
+
+# Status for each classify() code, from farthest to closest
+STATUSES = ('RED', 'YELLOW', 'GREEN')
+
+GREEN_RADIUS_M = 200  # Within this distance the user is at the task
+YELLOW_RADIUS_M = 1000  # Within this distance the user is nearby
+
+
+def haversine_m(lat1, lon1, lat2, lon2):
+    """
+    Great-circle distance in meters between two coordinates
+    
+    Within ~0.5% of the geodesic distance, which is plenty for the
+    200m/1000m productivity thresholds.
+    """
+    dlat = radians(lat2 - lat1)
+    dlon = radians(lon2 - lon1)
+    a = sin(dlat / 2) ** 2 + cos(radians(lat1)) * cos(radians(lat2)) * sin(dlon / 2) ** 2
+    return 12742000.0 * asin(sqrt(a))
+
+
+def classify(lat1, lon1, lat2, lon2):
+    """
+    Distance between two coordinates and its proximity code
+    
+    Returns (distance_meters, code) where code indexes STATUSES:
+    0 = RED (far away), 1 = YELLOW (nearby), 2 = GREEN (at location)
+    """
+    distance = haversine_m(lat1, lon1, lat2, lon2)
+    if distance < GREEN_RADIUS_M:
+        return distance, 2
+    if distance < YELLOW_RADIUS_M:
+        return distance, 1
+    return distance, 0
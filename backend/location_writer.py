@@ -0,0 +1,97 @@
+"""
+Write-behind queue for users' last verified location
+
+verify_location hands updates to a LocationWriter instead of committing in
+the request. A background thread batches them into a single executemany
+UPDATE every flush interval (or once a batch fills up).
+"""
+
+import atexit
+import queue
+import threading
+import time
+from sqlalchemy import update
+from models.user import User, db
+
+
+class LocationWriter:
+    """Batches last-verified-location updates onto a background thread"""
+    
+    def __init__(self, app, batch_size=100, flush_interval=0.5):
+        self.app = app
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.write_behind = app.config['LOCATION_WRITE_BEHIND']
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+    
+    def submit(self, user_id, lat, lng, address, verified_at):
+        """Record a user's latest verified location"""
+        row = {
+            'id': user_id,
+            'last_verified_location': address,
+            'last_verified_lat': lat,
+            'last_verified_lng': lng,
+            'last_verification_time': verified_at
+        }
+        if not self.write_behind:
+            self._write([row])
+            return
+        
+        self._ensure_started()
+        self._queue.put_nowait(row)
+    
+    def flush(self):
+        """Write everything still queued (used at interpreter exit)"""
+        batch = []
+        while True:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        if batch:
+            with self.app.app_context():
+                self._write(batch)
+    
+    def _ensure_started(self):
+        """Start the worker thread on first use (after any fork)"""
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='location-writer', daemon=True)
+                self._thread.start()
+                atexit.register(self.flush)
+    
+    def _run(self):
+        """Collect queued updates into batches and write them"""
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+            
+            with self.app.app_context():
+                self._write(batch)
+    
+    def _write(self, batch):
+        """
+        Apply a batch of updates, keeping only the latest per user
+        
+        Relies on SQLAlchemy 2.0's ORM bulk UPDATE by primary key (each row
+        dict carries 'id'); 1.4 would emit the UPDATE without a WHERE clause.
+        """
+        latest = {row['id']: row for row in batch}
+        try:
+            db.session.execute(update(User), list(latest.values()))
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            self.app.logger.exception('Failed to write %d location update(s)', len(latest))
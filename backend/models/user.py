@@ -1,9 +1,15 @@
 from flask_sqlalchemy import SQLAlchemy
-from werkzeug.security import generate_password_hash, check_password_hash
+from sqlalchemy.orm import validates
+from werkzeug.security import check_password_hash
+from argon2 import PasswordHasher
+from argon2.exceptions import VerifyMismatchError, InvalidHashError
 from datetime import datetime
 
 db = SQLAlchemy()
 
+# Argon2id hasher shared by all users
+password_hasher = PasswordHasher(time_cost=2, memory_cost=65536, parallelism=2)
+
 
 class User(db.Model):
     """
@@ -14,6 +20,12 @@ class User(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     username = db.Column(db.String(80), unique=True, nullable=False)
     email = db.Column(db.String(120), unique=True, nullable=False)
+    
+    # Case-insensitive lookups for login/signup go through lower()
+    __table_args__ = (
+        db.Index('ix_users_username_lower', db.func.lower(username), unique=True),
+        db.Index('ix_users_email_lower', db.func.lower(email), unique=True),
+    )
     password = db.Column(db.String(200), nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     last_verified_location = db.Column(db.String(255), nullable=True)
@@ -21,21 +33,44 @@ class User(db.Model):
     last_verified_lng = db.Column(db.Float, nullable=True)
     last_verification_time = db.Column(db.DateTime, nullable=True)
     
+    @validates('email')
+    def normalize_email(self, key, email):
+        """Store emails lowercased"""
+        return email.strip().lower()
+    
     def set_password(self, password):
         """Hash and set password"""
-        self.password = generate_password_hash(password)
+        self.password = password_hasher.hash(password)
     
     def check_password(self, password):
-        """Verify password hash"""
-        return check_password_hash(self.password, password)
+        """
+        Verify password hash
+        
+        Legacy Werkzeug (PBKDF2/scrypt) hashes and outdated Argon2 parameters
+        are re-hashed on a successful check; the caller commits the change.
+        """
+        if not self.password.startswith('$argon2'):
+            if not check_password_hash(self.password, password):
+                return False
+            self.set_password(password)
+            return True
+        
+        try:
+            password_hasher.verify(self.password, password)
+        except (VerifyMismatchError, InvalidHashError):
+            return False
+        
+        if password_hasher.check_needs_rehash(self.password):
+            self.set_password(password)
+        return True
     
     def to_dict(self):
-        """Convert user to dictionary"""
+        """Convert user to dictionary (datetimes are serialized by the JSON provider)"""
         return {
             'id': self.id,
             'username': self.username,
             'email': self.email,
-            'created_at': self.created_at.isoformat(),
+            'created_at': self.created_at,
             'last_verified_location': self.last_verified_location,
-            'last_verification_time': self.last_verification_time.isoformat() if self.last_verification_time else None
+            'last_verification_time': self.last_verification_time
         }
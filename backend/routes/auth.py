@@ -1,11 +1,26 @@
-from flask import Blueprint, request, jsonify
-from datetime import datetime, timedelta
-import jwt
+from flask import Blueprint, request, jsonify, current_app
+from functools import lru_cache
+import threading
+from cachetools import TTLCache
+import time
+import orjson
+from jwt.algorithms import HMACAlgorithm
+from jwt.utils import base64url_encode
+from sqlalchemy import select, func
+from sqlalchemy.exc import IntegrityError
 from models.user import User, db
-from decorators import token_required
+from decorators import token_required, conditional_per_user
 
 auth_bp = Blueprint('auth', __name__, url_prefix='/api/auth')
 
+# HS256 signer and the constant JWT header segment, built once
+_jwt_hs256 = HMACAlgorithm(HMACAlgorithm.SHA256)
+_JWT_HEADER_SEGMENT = base64url_encode(b'{"alg":"HS256","typ":"JWT"}')
+
+# Recently issued login tokens, keyed by (signing secret, user id)
+_login_token_cache = TTLCache(maxsize=10000, ttl=15)
+_login_token_cache_lock = threading.Lock()
+
 
 @auth_bp.route('/signup', methods=['POST'])
 def signup():
@@ -46,31 +61,21 @@ def signup():
                 'message': 'Password must be at least 6 characters long'
             }), 400
         
-        # Check if user already exists
-        if User.query.filter_by(username=username).first():
-            return jsonify({
-                'status': 'error',
-                'message': 'Username already exists'
-            }), 409
-        
-        if User.query.filter_by(email=email).first():
-            return jsonify({
-                'status': 'error',
-                'message': 'Email already registered'
-            }), 409
-        
-        # Create new user
+        # Create new user; the unique indexes reject duplicates
         user = User(username=username, email=email)
         user.set_password(password)
         
         db.session.add(user)
-        db.session.commit()
+        try:
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+            return jsonify({
+                'status': 'error',
+                'message': duplicate_user_message(username)
+            }), 409
         
-        # Generate token
-        token = jwt.encode({
-            'user_id': user.id,
-            'exp': datetime.utcnow() + timedelta(days=30)
-        }, jwt_secret_key(), algorithm='HS256')
+        token = generate_token(user)
         
         return jsonify({
             'status': 'success',
@@ -111,9 +116,12 @@ def login():
         username = data.get('username').strip()
         password = data.get('password')
         
-        # Find user by username or email
+        # Find user by username or email. Case folding happens in the database on
+        # both sides so it matches the lower() indexes (SQLite only folds ASCII);
+        # emails are stored Python-lowercased, so the input is lowercased the same way
         user = User.query.filter(
-            (User.username == username) | (User.email == username)
+            (func.lower(User.username) == func.lower(username)) |
+            (func.lower(User.email) == func.lower(username.lower()))
         ).first()
         
         if not user or not user.check_password(password):
@@ -122,11 +130,18 @@ def login():
                 'message': 'Invalid username/email or password'
             }), 401
         
-        # Generate token
-        token = jwt.encode({
-            'user_id': user.id,
-            'exp': datetime.utcnow() + timedelta(days=30)
-        }, jwt_secret_key(), algorithm='HS256')
+        # Persist a re-hashed password (legacy or outdated parameters)
+        if user in db.session.dirty:
+            db.session.commit()
+        
+        # Repeat logins within a few seconds reuse the token just issued
+        cache_key = (current_app.config['SECRET_KEY'], user.id)
+        with _login_token_cache_lock:
+            token = _login_token_cache.get(cache_key)
+        if token is None:
+            token = generate_token(user)
+            with _login_token_cache_lock:
+                _login_token_cache[cache_key] = token
         
         return jsonify({
             'status': 'success',
@@ -144,6 +159,7 @@ def login():
 
 @auth_bp.route('/profile', methods=['GET'])
 @token_required
+@conditional_per_user()
 def get_profile(current_user):
     """Get current user profile (protected route)"""
     return jsonify({
@@ -162,7 +178,37 @@ def logout(current_user):
     }), 200
 
 
+def duplicate_user_message(username):
+    """Work out which unique field a failed signup collided on"""
+    taken = db.session.execute(
+        select(User.id).where(func.lower(User.username) == func.lower(username))
+    ).first()
+    return 'Username already exists' if taken else 'Email already registered'
+
+
+def generate_token(user):
+    """
+    Issue a signed HS256 JWT for the given user
+    
+    Equivalent to jwt.encode(..., algorithm='HS256'), but reuses the
+    pre-encoded header segment and signer, so only the payload is
+    serialized and signed per call.
+    """
+    payload = orjson.dumps({
+        'user_id': user.id,
+        'exp': int(time.time() + current_app.config['JWT_EXPIRATION_DELTA'].total_seconds())
+    })
+    signing_input = _JWT_HEADER_SEGMENT + b'.' + base64url_encode(payload)
+    signature = _jwt_hs256.sign(signing_input, jwt_secret_key())
+    return (signing_input + b'.' + base64url_encode(signature)).decode()
+
+
 def jwt_secret_key():
     """Get JWT secret key from app config"""
-    from flask import current_app
-    return current_app.config['SECRET_KEY']
+    return _encode_secret_key(current_app.config['SECRET_KEY'])
+
+
+@lru_cache(maxsize=4)
+def _encode_secret_key(secret_key):
+    """Encode the secret key once so PyJWT doesn't re-encode it per token"""
+    return secret_key.encode('utf-8') if isinstance(secret_key, str) else secret_key
@@ -1,14 +1,64 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app
 from datetime import datetime
+import threading
+from functools import partial, lru_cache
+from cachetools import TTLCache
+from geopy.adapters import RequestsAdapter
 from geopy.geocoders import Nominatim
-from geopy.distance import geodesic
-from models.user import User, db
-from decorators import token_required
+from decorators import token_required, conditional_per_user
+from address_store import normalize_address
+from location_core import classify, STATUSES
 
 location_bp = Blueprint('location', __name__, url_prefix='/api/location')
 
-# Initialize Nominatim with a unique user agent
-geolocator = Nominatim(user_agent="pivot_productivity_app_v1")
+
+@lru_cache(maxsize=1)
+def get_geolocator():
+    """
+    Nominatim client with a unique user agent, created on first use
+    
+    The requests adapter keeps a pooled keep-alive session so threaded
+    workers reuse connections to OSM.
+    """
+    return Nominatim(
+        user_agent="pivot_productivity_app_v1",
+        adapter_factory=partial(RequestsAdapter, pool_connections=32, pool_maxsize=64)
+    )
+
+
+# Geocoding results, keyed by normalized address -> (lat, lng, resolved_address)
+_geocode_cache = TTLCache(maxsize=10000, ttl=86400)
+_geocode_cache_lock = threading.Lock()
+
+
+def geocode_address(address):
+    """
+    Convert an address to coordinates, memoizing successful lookups
+    
+    Checks the in-process cache, then the local address store, and only
+    then Nominatim. Returns (latitude, longitude, resolved_address) or
+    None if not found.
+    """
+    key = normalize_address(address)
+    with _geocode_cache_lock:
+        cached = _geocode_cache.get(key)
+    if cached:
+        return cached
+    
+    store = current_app.extensions.get('address_store')
+    result = store.lookup(key) if store else None
+    
+    if result is None:
+        location = get_geolocator().geocode(address, timeout=10)
+        if not location:
+            return None
+        result = (location.latitude, location.longitude, location.address)
+        if store:
+            store.save(key, *result)
+    
+    with _geocode_cache_lock:
+        _geocode_cache[key] = result
+    return result
 
 
 @location_bp.route('/verify', methods=['POST'])
@@ -39,11 +89,24 @@ def verify_location(current_user):
                 'message': 'Missing required fields: lat, lng, target_address'
             }), 400
         
-        user_gps = (data['lat'], data['lng'])
+        try:
+            user_gps = (float(data['lat']), float(data['lng']))
+        except (TypeError, ValueError):
+            return jsonify({
+                'status': 'error',
+                'message': 'lat and lng must be numbers'
+            }), 400
+        
+        if not (-90 <= user_gps[0] <= 90 and -180 <= user_gps[1] <= 180):
+            return jsonify({
+                'status': 'error',
+                'message': 'lat must be within [-90, 90] and lng within [-180, 180]'
+            }), 400
+        
         target_address = data['target_address'].strip()
         
         # 1. Convert Address to Coordinates (Geocoding)
-        location = geolocator.geocode(target_address, timeout=10)
+        location = geocode_address(target_address)
         
         if not location:
             return jsonify({
@@ -51,34 +114,27 @@ def verify_location(current_user):
                 'message': 'Address not found'
             }), 404
         
-        target_gps = (location.latitude, location.longitude)
-        
-        # 2. Calculate Distance using geodesic (accurate for Earth's curvature)
-        distance_meters = geodesic(user_gps, target_gps).meters
+        target_lat, target_lng, target_resolved = location
+        target_gps = (target_lat, target_lng)
         
-        # 3. Productivity Logic - determine status based on distance
-        status = "RED"
-        if distance_meters < 200:
-            status = "GREEN"  # Within 200 meters of task
-        elif distance_meters < 1000:
-            status = "YELLOW"  # Nearby, but not at location
+        # 2. Calculate Distance and 3. Productivity Logic in one call
+        distance_meters, status_code = classify(*user_gps, *target_gps)
+        status = STATUSES[status_code]
         
-        # Update user's last verified location
-        current_user.last_verified_location = location.address
-        current_user.last_verified_lat = location.latitude
-        current_user.last_verified_lng = location.longitude
-        current_user.last_verification_time = datetime.utcnow()
-        db.session.commit()
+        # Update user's last verified location (written in the background)
+        current_app.extensions['location_writer'].submit(
+            current_user.id, target_lat, target_lng, target_resolved, datetime.utcnow()
+        )
         
         return jsonify({
             'status': 'success',
             'user_id': current_user.id,
             'productivity_status': status,
             'distance_meters': round(distance_meters, 2),
-            'verified_address': location.address,
+            'verified_address': target_resolved,
             'verified_coordinates': {
-                'latitude': location.latitude,
-                'longitude': location.longitude
+                'latitude': target_lat,
+                'longitude': target_lng
             },
             'proximity_details': {
                 'at_location': status == 'GREEN',
@@ -96,6 +152,7 @@ def verify_location(current_user):
 
 @location_bp.route('/history', methods=['GET'])
 @token_required
+@conditional_per_user()
 def get_location_history(current_user):
     """Get user's last verified location"""
     return jsonify({
@@ -108,6 +165,6 @@ def get_location_history(current_user):
                 'latitude': current_user.last_verified_lat,
                 'longitude': current_user.last_verified_lng
             } if current_user.last_verified_lat else None,
-            'last_verification_time': current_user.last_verification_time.isoformat() if current_user.last_verification_time else None
+            'last_verification_time': current_user.last_verification_time
         }
     }), 200
@@ -11,6 +11,10 @@ from app import create_app
 
 BASE_URL = 'http://localhost:5000/api'
 
+# Shared session: reuses the TCP connection and default headers across tests
+SESSION = requests.Session()
+SESSION.headers.update({'Content-Type': 'application/json'})
+
 # Test data
 TEST_USER = {
     'username': f'testuser_{int(datetime.now().timestamp())}',
@@ -32,31 +36,30 @@ def print_response(title, response):
 
 def test_health():
     """Test health check endpoint"""
-    response = requests.get(f'{BASE_URL}/health')
+    response = SESSION.get(f'{BASE_URL}/health')
     print_response('Health Check', response)
     return response.status_code == 200
 
 def test_signup():
     """Test user signup"""
-    response = requests.post(
+    response = SESSION.post(
         f'{BASE_URL}/auth/signup',
-        json=TEST_USER,
-        headers={'Content-Type': 'application/json'}
+        json=TEST_USER
     )
     print_response('User Signup', response)
     
     if response.status_code == 201:
         data = response.json()
         TEST_USER['token'] = data.get('token')
+        SESSION.headers['Authorization'] = f"Bearer {TEST_USER['token']}"
         return True
     return False
 
 def test_duplicate_signup():
     """Test signup with duplicate username (should fail)"""
-    response = requests.post(
+    response = SESSION.post(
         f'{BASE_URL}/auth/signup',
-        json=TEST_USER,
-        headers={'Content-Type': 'application/json'}
+        json=TEST_USER
     )
     print_response('Duplicate Signup (Should Fail)', response)
     return response.status_code == 409
@@ -68,36 +71,55 @@ def test_invalid_signup():
         'email': 'invalid@example.com',
         'password': '123'  # Too short
     }
-    response = requests.post(
+    response = SESSION.post(
         f'{BASE_URL}/auth/signup',
-        json=invalid_data,
-        headers={'Content-Type': 'application/json'}
+        json=invalid_data
     )
     print_response('Invalid Signup (Should Fail)', response)
     return response.status_code == 400
 
 def test_login():
     """Test user login"""
-    response = requests.post(
+    response = SESSION.post(
         f'{BASE_URL}/auth/login',
         json={
             'username': TEST_USER['username'],
             'password': TEST_USER['password']
-        },
-        headers={'Content-Type': 'application/json'}
+        }
     )
     print_response('User Login', response)
     return response.status_code == 200
 
+def test_login_non_ascii_username():
+    """Test signup + login with a non-ASCII uppercase username (exact spelling)"""
+    user = {
+        'username': f"Ömer_{int(datetime.now().timestamp())}",
+        'email': f"omer_{int(datetime.now().timestamp())}@example.com",
+        'password': 'TestPassword123'
+    }
+    response = SESSION.post(f'{BASE_URL}/auth/signup', json=user)
+    if response.status_code != 201:
+        print_response('Non-ASCII Username Signup', response)
+        return False
+    
+    response = SESSION.post(
+        f'{BASE_URL}/auth/login',
+        json={
+            'username': user['username'],
+            'password': user['password']
+        }
+    )
+    print_response('Login with Non-ASCII Username', response)
+    return response.status_code == 200
+
 def test_login_invalid_password():
     """Test login with wrong password (should fail)"""
-    response = requests.post(
+    response = SESSION.post(
         f'{BASE_URL}/auth/login',
         json={
             'username': TEST_USER['username'],
             'password': 'WrongPassword123'
-        },
-        headers={'Content-Type': 'application/json'}
+        }
     )
     print_response('Login with Invalid Password (Should Fail)', response)
     return response.status_code == 401
@@ -108,21 +130,16 @@ def test_get_profile():
         print("Skipping profile test - no token available")
         return False
     
-    response = requests.get(
-        f'{BASE_URL}/auth/profile',
-        headers={
-            'Authorization': f"Bearer {TEST_USER['token']}",
-            'Content-Type': 'application/json'
-        }
-    )
+    response = SESSION.get(f'{BASE_URL}/auth/profile')
     print_response('Get User Profile', response)
     return response.status_code == 200
 
 def test_get_profile_no_token():
     """Test getting profile without token (should fail)"""
-    response = requests.get(
+    # None drops the session's Authorization header for this request only
+    response = SESSION.get(
         f'{BASE_URL}/auth/profile',
-        headers={'Content-Type': 'application/json'}
+        headers={'Authorization': None}
     )
     print_response('Get Profile Without Token (Should Fail)', response)
     return response.status_code == 401
@@ -133,13 +150,7 @@ def test_logout():
         print("Skipping logout test - no token available")
         return False
     
-    response = requests.post(
-        f'{BASE_URL}/auth/logout',
-        headers={
-            'Authorization': f"Bearer {TEST_USER['token']}",
-            'Content-Type': 'application/json'
-        }
-    )
+    response = SESSION.post(f'{BASE_URL}/auth/logout')
     print_response('User Logout', response)
     return response.status_code == 200
 
@@ -156,13 +167,9 @@ def test_verify_location():
         'target_address': 'Times Square, New York, NY'
     }
     
-    response = requests.post(
+    response = SESSION.post(
         f'{BASE_URL}/location/verify',
-        json=location_data,
-        headers={
-            'Authorization': f"Bearer {TEST_USER['token']}",
-            'Content-Type': 'application/json'
-        }
+        json=location_data
     )
     print_response('Verify Location', response)
     return response.status_code == 200
@@ -179,13 +186,9 @@ def test_verify_location_invalid():
         'target_address': 'INVALID_ADDRESS_THAT_DOES_NOT_EXIST_123456789'
     }
     
-    response = requests.post(
+    response = SESSION.post(
         f'{BASE_URL}/location/verify',
-        json=location_data,
-        headers={
-            'Authorization': f"Bearer {TEST_USER['token']}",
-            'Content-Type': 'application/json'
-        }
+        json=location_data
     )
     print_response('Verify Location with Invalid Address (Should Fail)', response)
     return response.status_code == 404
@@ -196,13 +199,7 @@ def test_get_location_history():
         print("Skipping location history test - no token available")
         return False
     
-    response = requests.get(
-        f'{BASE_URL}/location/history',
-        headers={
-            'Authorization': f"Bearer {TEST_USER['token']}",
-            'Content-Type': 'application/json'
-        }
-    )
+    response = SESSION.get(f'{BASE_URL}/location/history')
     print_response('Get Location History', response)
     return response.status_code == 200
 
@@ -219,6 +216,7 @@ def run_all_tests():
         ('Invalid Signup', test_invalid_signup),
         ('User Login', test_login),
         ('Login Invalid Password', test_login_invalid_password),
+        ('Login Non-ASCII Username', test_login_non_ascii_username),
         ('Get Profile Without Token', test_get_profile_no_token),
         ('Get User Profile', test_get_profile),
         ('Verify Location', test_verify_location),
@@ -37,6 +37,13 @@ def check_imports():
         errors.append(f"❌ decorators.py - {str(e)}")
         traceback.print_exc()
     
+    try:
+        from json_provider import OrjsonProvider
+        print("✅ json_provider.py - OK")
+    except Exception as e:
+        errors.append(f"❌ json_provider.py - {str(e)}")
+        traceback.print_exc()
+    
     # Test 4: Import routes
     try:
         from routes.auth import auth_bp
@@ -1,8 +1,14 @@
 """
 WSGI entry point for production deployment
 
-Use with Gunicorn:
-    gunicorn wsgi:app
+Use with Gunicorn (pre-forked workers, threaded):
+    gunicorn -w 4 -k gthread --threads 8 --worker-tmp-dir /dev/shm wsgi:app
+
+Or with waitress (pure Python, also runs on Windows; 8 threads on port 3000):
+    python -c "from app import serve; serve()"
+
+With FLASK_ENV=production tables are not created on boot; run once per deploy:
+    flask --app wsgi init-db
 
 Or other WSGI servers (uWSGI, etc.)
 """